@@ -1,24 +1,25 @@
 
 import argparse
-import os
 from decimal import Decimal
-from binance.client import Client
+
+import numpy as np
+import clients
+import exchange_info
 from logger_config import get_logger
 from validation import validate_symbol, validate_quantity, validate_price
+from ws_client import submit_batch
 
 logger = get_logger(__name__)
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
+
+# Fallback quantizer for dry-run, when exchange filters aren't available
+QUANT = Decimal("1.00")
 
 
 def create_client():
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    return clients.get_client()
 
 
-def create_grid(client, symbol: str, low: Decimal, high: Decimal, steps: int, qty_per_order: Decimal, dry_run=True):
+def create_grid(client, symbol: str, low: Decimal, high: Decimal, steps: int, qty_per_order: Decimal, dry_run=True, order_client=None):
     """
     Splits the price range [low, high] into `steps` intervals
     and places one BUY limit order at each grid price.
@@ -27,28 +28,41 @@ def create_grid(client, symbol: str, low: Decimal, high: Decimal, steps: int, qt
     if low >= high:
         raise ValueError("low must be < high")
 
-    step_size = (high - low) / Decimal(steps)
-    orders = []
-
-    for i in range(steps + 1):
-        price = (low + step_size * i).quantize(Decimal("1.00"))  # adjust precision as needed
-        if dry_run or client is None:
-            logger.info(f"Dry-run grid order {i}: BUY {qty_per_order} @ {price}")
-            orders.append({"price": str(price), "qty": str(qty_per_order), "status": "DRY_RUN"})
-        else:
-            try:
-                res = client.futures_create_order(
-                    symbol=symbol,
-                    side="BUY",
-                    type="LIMIT",
-                    timeInForce="GTC",
-                    quantity=float(qty_per_order),
-                    price=str(price),
-                )
-                orders.append(res)
-            except Exception:
-                logger.exception(f"Failed to place grid order at {price}")
+    # Use the symbol's real PRICE_FILTER tick size so orders pass the
+    # exchange filters on the first try; dry-run falls back to QUANT
+    filters = exchange_info.get_filters(client, symbol)
+    tick = filters[0] if filters else QUANT
+    decimals = exchange_info.price_decimals(tick)
+
+    qty_str = format(qty_per_order, "f")
+    # Vectorized price ladder: one linspace + round instead of per-step
+    # Decimal arithmetic; Decimal stays at the validation/logging boundary
+    grid = np.round(np.linspace(float(low), float(high), steps + 1), decimals)
+    prices = [f"{p:.{decimals}f}" for p in grid]
+
+    if dry_run or client is None:
+        orders = []
+        for i, price in enumerate(prices):
+            logger.info("Dry-run grid order %d: BUY %s @ %s", i, qty_str, price)
+            orders.append({"price": price, "qty": qty_str, "status": "DRY_RUN"})
+        return orders
 
+    params = [
+        {
+            "symbol": symbol,
+            "side": "BUY",
+            "type": "LIMIT",
+            "timeInForce": "GTC",
+            "quantity": qty_str,
+            "price": price,
+        }
+        for price in prices
+    ]
+    # Batched submission: 5 orders per round trip instead of one each
+    orders = submit_batch(client, order_client, params)
+    for price, res in zip(prices, orders):
+        if "code" in res and "orderId" not in res:
+            logger.error("Failed to place grid order at %s: %s", price, res)
     return orders
 
 
@@ -73,5 +87,6 @@ if __name__ == "__main__":
         raise SystemExit(1)
 
     client = create_client()
-    res = create_grid(client, symbol, low, high, steps, qty, dry_run=args.dry_run)
+    order_client = clients.get_order_client() if not args.dry_run else None
+    res = create_grid(client, symbol, low, high, steps, qty, dry_run=args.dry_run, order_client=order_client)
     logger.info(f"Grid result: {res}")
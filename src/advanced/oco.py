@@ -1,11 +1,12 @@
 import os
-import time
 import argparse
+import uuid
 from decimal import Decimal
-from threading import Thread
-from binance.client import Client
+import clients
+import runtime
 from logger_config import get_logger
 from validation import validate_symbol, validate_side, validate_quantity, validate_price
+from ws_client import submit_batch
 
 logger = get_logger(__name__)
 
@@ -14,13 +15,58 @@ API_SECRET = os.getenv("BINANCE_API_SECRET")
 
 
 def create_client():
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    return clients.get_client()
 
 
-def place_oco(client, symbol, side, qty, tp_price: Decimal, sl_price: Decimal, dry_run=True):
+# Maps each open OCO leg to its sibling's client order ID. Legs are keyed
+# by their pre-assigned client order ID (registered BEFORE submission, so a
+# fill pushed ahead of the batch response still matches) and additionally
+# by exchange orderId once the response arrives.
+_open_ocos = {}
+_user_stream_started = False
+
+
+def _ensure_user_stream(client):
+    """
+    Start the futures USER_DATA stream once and cancel OCO siblings from its
+    ORDER_TRADE_UPDATE events. Fills are pushed in tens of ms instead of
+    being polled every 2s, and one socket covers every open OCO. The stream
+    rides on the shared socket manager from `runtime`, which also handles
+    the listen-key keepalive.
+    """
+    global _user_stream_started
+    if _user_stream_started:
+        return
+
+    def on_user_event(msg):
+        if msg.get("e") != "ORDER_TRADE_UPDATE":
+            return
+        o = msg.get("o", {})
+        if o.get("X") != "FILLED":
+            return
+        # Match on client order ID or exchange orderId, whichever we have
+        filled_cid = o.get("c")
+        sibling = _open_ocos.pop(filled_cid, None)
+        if sibling is None:
+            sibling = _open_ocos.pop(o.get("i"), None)
+        if sibling is None:
+            return
+        # Drop every remaining alias of both legs
+        for key in [k for k, v in _open_ocos.items() if v == sibling or v == filled_cid]:
+            _open_ocos.pop(key, None)
+        try:
+            client.futures_cancel_order(symbol=o.get("s"), origClientOrderId=sibling)
+            logger.info("Order %s filled — cancelled sibling %s", filled_cid, sibling)
+        except Exception:
+            logger.exception("Failed to cancel OCO sibling order")
+
+    twm = runtime.get_ws_manager(API_KEY, API_SECRET)
+    twm.start_futures_user_socket(callback=on_user_event)
+    _user_stream_started = True
+    logger.info("Subscribed to futures user-data stream for OCO fills")
+
+
+def place_oco(client, symbol, side, qty, tp_price: Decimal, sl_price: Decimal, dry_run=True, order_client=None):
     logger.info(f"Placing OCO emulation: {symbol} {side} qty={qty} TP={tp_price} SL={sl_price}")
     if dry_run or client is None:
         logger.info("Dry-run mode: not placing real OCO orders")
@@ -30,50 +76,55 @@ def place_oco(client, symbol, side, qty, tp_price: Decimal, sl_price: Decimal, d
     tp_side = side
     sl_side = "SELL" if side == "BUY" else "BUY"
 
+    # Pre-assign client order IDs so the pair can be registered before the
+    # batch is even submitted
+    tp_cid = f"oco-tp-{uuid.uuid4().hex[:16]}"
+    sl_cid = f"oco-sl-{uuid.uuid4().hex[:16]}"
+    tp_params = {
+        "symbol": symbol,
+        "side": tp_side,
+        "type": "LIMIT",
+        "timeInForce": "GTC",
+        "quantity": format(qty, "f"),
+        "price": str(tp_price),
+        "newClientOrderId": tp_cid,
+    }
+    # closePosition is deliberately omitted: False is the default, and a
+    # Python bool would sign differently from its JSON wire form
+    sl_params = {
+        "symbol": symbol,
+        "side": sl_side,
+        "type": "STOP_MARKET",
+        "stopPrice": str(sl_price),
+        "quantity": format(qty, "f"),
+        "newClientOrderId": sl_cid,
+    }
+
     try:
-        # Place take-profit (limit) order
-        tp_order = client.futures_create_order(
-            symbol=symbol,
-            side=tp_side,
-            type="LIMIT",
-            timeInForce="GTC",
-            quantity=float(qty),
-            price=str(tp_price),
-        )
-        # Place stop-market order
-        sl_order = client.futures_create_order(
-            symbol=symbol,
-            side=sl_side,
-            type="STOP_MARKET",
-            stopPrice=str(sl_price),
-            closePosition=False,
-            quantity=float(qty),
-        )
+        # Open the user stream and register the pair BEFORE submitting: an
+        # ORDER_TRADE_UPDATE can be pushed ahead of the batch response, and
+        # a fill in that window must still cancel its sibling
+        _ensure_user_stream(client)
+        _open_ocos[tp_cid] = sl_cid
+        _open_ocos[sl_cid] = tp_cid
+
+        # Submit both legs as one batch: a single round trip, and no window
+        # where the TP is live before the SL is even placed
+        tp_order, sl_order = submit_batch(client, order_client, [tp_params, sl_params])
+        for leg, res in (("TP", tp_order), ("SL", sl_order)):
+            if "code" in res and "orderId" not in res:
+                raise RuntimeError(f"{leg} leg rejected: {res}")
         logger.info(f"TP order: {tp_order}")
         logger.info(f"SL order: {sl_order}")
 
-        # Background watcher thread: cancels the other when one fills
-        def watcher():
-            while True:
-                try:
-                    tp_status = client.futures_get_order(symbol=symbol, orderId=tp_order.get("orderId"))
-                    sl_status = client.futures_get_order(symbol=symbol, orderId=sl_order.get("orderId"))
-                    logger.debug(f"TP status: {tp_status.get('status')}, SL status: {sl_status.get('status')}")
-                    if tp_status.get("status") == "FILLED":
-                        client.futures_cancel_order(symbol=symbol, orderId=sl_order.get("orderId"))
-                        logger.info("TP filled — cancelled SL")
-                        break
-                    if sl_status.get("status") == "FILLED":
-                        client.futures_cancel_order(symbol=symbol, orderId=tp_order.get("orderId"))
-                        logger.info("SL filled — cancelled TP")
-                        break
-                except Exception:
-                    logger.exception("Error while watching OCO orders")
-                time.sleep(2)
-
-        Thread(target=watcher, daemon=True).start()
+        # Also index the pair by exchange orderId for events carrying only i
+        _open_ocos[tp_order.get("orderId")] = sl_cid
+        _open_ocos[sl_order.get("orderId")] = tp_cid
         return {"tp": tp_order, "sl": sl_order}
     except Exception:
+        # Unwind the pre-registration so dead pairs don't linger
+        for cid in (tp_cid, sl_cid):
+            _open_ocos.pop(cid, None)
         logger.exception("Failed to place OCO orders")
         raise
 
@@ -99,5 +150,6 @@ if __name__ == "__main__":
         raise SystemExit(1)
 
     client = create_client()
-    res = place_oco(client, symbol, side, qty, tp, sl, dry_run=args.dry_run)
+    order_client = clients.get_order_client() if not args.dry_run else None
+    res = place_oco(client, symbol, side, qty, tp, sl, dry_run=args.dry_run, order_client=order_client)
     logger.info(f"Placed OCO result: {res}")
@@ -1,9 +1,13 @@
 
 import argparse
+import operator
 import time
 import os
 from decimal import Decimal
-from binance.client import Client
+import clients
+import exchange_info
+import runtime
+from spsc import SPSCRing
 from logger_config import get_logger
 from validation import validate_symbol, validate_side, validate_quantity, validate_price
 
@@ -13,48 +17,105 @@ API_SECRET = os.getenv("BINANCE_API_SECRET")
 
 
 def create_client():
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    return clients.get_client()
+
+
+def _price_to_ticks(raw: str, decimals: int) -> int:
+    """
+    Parse a price string straight into an integer tick count without going
+    through float or Decimal — e.g. ("100.50", 2) -> 10050. Sub-tick digits
+    are truncated.
+    """
+    whole, _, frac = raw.partition(".")
+    if not decimals:
+        return int(whole)
+    return int(whole + (frac + "0" * decimals)[:decimals])
 
 
 def stop_limit_watch_and_place(client, symbol, side, qty, stop_price: Decimal, limit_price: Decimal, dry_run=True, poll_interval=2):
     """
-    Polls the ticker price and when the stop condition is met, places a limit order.
+    Subscribes to the <symbol>@bookTicker WebSocket stream and, when the stop
+    condition is met, places a limit order. Trigger events are pushed by the
+    exchange instead of polled over REST, so detection lag is tens of ms
+    instead of the old 1-2s polling lag. `poll_interval` now acts as a
+    heartbeat timeout: if no tick arrives within it, the socket is reopened.
     Returns the order response or a dry-run dictionary.
     """
     logger.info(f"Starting stop-limit watcher: {symbol} stop={stop_price} limit={limit_price} side={side}")
     if dry_run or client is None:
         logger.info("Dry-run mode: will not place real orders. Simulating trigger check.")
-        # Simulate a few polling cycles in dry-run for log clarity
+        # Simulate a few heartbeat cycles in dry-run for log clarity
         for i in range(2):
-            logger.debug(f"Dry-run poll {i+1}: price=SIMULATED")
+            logger.debug("Dry-run heartbeat %d: price=SIMULATED", i + 1)
             time.sleep(poll_interval)
         return {"status": "DRY_RUN", "symbol": symbol, "side": side, "qty": str(qty), "stop": str(stop_price), "limit": str(limit_price)}
 
-    while True:
-        try:
-            ticker = client.futures_symbol_ticker(symbol=symbol)
-            price = Decimal(ticker.get("price"))
-            logger.debug(f"Current price for {symbol}: {price}")
-            # For BUY: trigger when price >= stop_price
-            # For SELL: trigger when price <= stop_price
-            if (side == "BUY" and price >= stop_price) or (side == "SELL" and price <= stop_price):
-                logger.info(f"Stop price hit (price={price}) — placing limit order {side} {qty} @ {limit_price}")
-                order = client.futures_create_order(
-                    symbol=symbol,
-                    side=side,
-                    type="LIMIT",
-                    timeInForce="GTC",
-                    quantity=float(qty),
-                    price=str(limit_price),
-                )
-                logger.info(f"Placed limit order: {order}")
-                return order
-        except Exception:
-            logger.exception("Error in stop-limit watcher")
-        time.sleep(poll_interval)
+    # Hot-path comparison works on integer tick counts: the stop price is
+    # scaled to ticks once here, each incoming price string is parsed
+    # directly to ticks, and the two are compared as plain ints. The
+    # BUY/SELL direction is resolved once into a comparison operator so the
+    # per-tick path has no side branch and no Decimal/float construction.
+    filters = exchange_info.get_filters(client, symbol)
+    tick_size = filters[0] if filters else None
+    decimals = exchange_info.price_decimals(tick_size) if tick_size else max(0, -stop_price.as_tuple().exponent)
+    stop_ticks = int(stop_price.scaleb(decimals))
+    crossed = operator.ge if side == "BUY" else operator.le
+
+    # The stream callback (producer) only enqueues raw price strings into a
+    # lock-free SPSC ring; parsing and the trigger comparison run on this
+    # thread (consumer), which drains ticks in batches. No mutex or
+    # condition variable sits between the reader and the order logic.
+    ring = SPSCRing()
+    # BUY triggers off the best ask, SELL off the best bid
+    price_field = "a" if side == "BUY" else "b"
+
+    def on_tick(msg):
+        raw = msg.get("data", msg).get(price_field)
+        if raw is not None:
+            ring.put_nowait(raw)
+
+    stream_name = f"{symbol.lower()}@bookTicker"
+    twm = runtime.get_ws_manager(API_KEY, API_SECRET)
+    socket = twm.start_futures_multiplex_socket(callback=on_tick, streams=[stream_name])
+    logger.info(f"Subscribed to {stream_name}")
+
+    try:
+        trigger_raw = None
+        last_tick = time.monotonic()
+        while trigger_raw is None:
+            batch = ring.get_many(timeout=0.001)
+            if not batch:
+                # Heartbeat check: reopen the socket if the stream went quiet
+                if time.monotonic() - last_tick > poll_interval:
+                    logger.warning("No tick for %ss on %s; reconnecting", poll_interval, stream_name)
+                    twm.stop_socket(socket)
+                    socket = twm.start_futures_multiplex_socket(callback=on_tick, streams=[stream_name])
+                    last_tick = time.monotonic()
+                continue
+            last_tick = time.monotonic()
+            for raw in batch:
+                if crossed(_price_to_ticks(raw, decimals), stop_ticks):
+                    trigger_raw = raw
+                    break
+
+        price = Decimal(trigger_raw)
+        logger.info(f"Stop price hit (price={price}) — placing limit order {side} {qty} @ {limit_price}")
+        order = client.futures_create_order(
+            symbol=symbol,
+            side=side,
+            type="LIMIT",
+            timeInForce="GTC",
+            quantity=format(qty, "f"),
+            price=str(limit_price),
+        )
+        logger.info(f"Placed limit order: {order}")
+        return order
+    except Exception:
+        logger.exception("Error in stop-limit watcher")
+        raise
+    finally:
+        # Only close our subscription; the manager is shared across strategies
+        twm.stop_socket(socket)
 
 
 if __name__ == "__main__":
@@ -65,7 +126,7 @@ if __name__ == "__main__":
     p.add_argument("--stop", required=True, help="trigger price")
     p.add_argument("--limit", required=True, help="limit order price to place once triggered")
     p.add_argument("--dry-run", action="store_true")
-    p.add_argument("--poll-interval", type=int, default=2, help="polling interval seconds")
+    p.add_argument("--poll-interval", type=int, default=2, help="heartbeat timeout seconds for the stream")
     args = p.parse_args()
 
     try:
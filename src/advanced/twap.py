@@ -1,66 +1,98 @@
 
 import argparse
 import time
-import os
-from decimal import Decimal, ROUND_DOWN, getcontext
-from binance.client import Client
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_DOWN, localcontext
+import clients
 from logger_config import get_logger
 from validation import validate_symbol, validate_side, validate_twap_params
-
-# Increase decimal precision for slicing calculations
-getcontext().prec = 12
+from ws_client import submit_order
 
 logger = get_logger(__name__)
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
 
 
 def create_client():
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    return clients.get_client()
 
 
-def run_twap(client, symbol: str, side: str, total_qty: Decimal, chunks: int, duration_s: int, dry_run=True):
+def run_twap(client, symbol: str, side: str, total_qty: Decimal, chunks: int, duration_s: int, dry_run=True, order_client=None, chunks_dec=None):
     """
     Executes TWAP by sending `chunks` market orders spaced evenly across `duration_s`.
-    Returns a list of results (responses or dry-run records).
+    An injected WSOrderClient is reused across all chunks so each chunk skips
+    the REST round-trip overhead. Returns a list of results (responses or
+    dry-run records).
     """
     logger.info(f"Starting TWAP: {symbol} {side} total={total_qty} chunks={chunks} duration={duration_s}s")
-    # Calculate per-chunk quantity with safe rounding down to avoid over-ordering
-    qty_per = (total_qty / Decimal(chunks)).quantize(Decimal("1e-8"), rounding=ROUND_DOWN)
-    remainder = total_qty - (qty_per * Decimal(chunks))
+    # All the Decimal slicing math happens once, under a local context with
+    # pinned precision and rounding — no mutation of the process-wide
+    # context, and deterministic chunk sizes regardless of what other
+    # modules do to it. Rounding down avoids over-ordering.
+    if chunks_dec is None:
+        chunks_dec = Decimal(chunks)
+    with localcontext() as ctx:
+        ctx.prec = 12
+        ctx.rounding = ROUND_DOWN
+        qty_per = (total_qty / chunks_dec).quantize(Decimal("1e-8"), rounding=ROUND_DOWN)
+        remainder = total_qty - (qty_per * chunks_dec)
+        last_qty = qty_per + remainder
     interval = duration_s / max(1, chunks)
 
     logger.info(f"Each chunk: {qty_per} (remainder carried until last chunk) every {interval:.2f}s")
 
+    # Precompute both chunk sizes' API representations once so the loop
+    # body does no Decimal arithmetic or conversions
+    qty_per_str = format(qty_per, "f")
+    last_qty_str = format(last_qty, "f")
+
     results = []
-    for i in range(chunks):
-        # Add remainder to the last chunk
-        execute_qty = qty_per + (remainder if i == (chunks - 1) else Decimal("0"))
-        logger.info(f"TWAP chunk {i+1}/{chunks} qty={execute_qty}")
-
-        if dry_run or client is None:
-            logger.info("Dry-run: skipping actual market order")
-            results.append({"chunk": i + 1, "status": "DRY_RUN", "qty": str(execute_qty)})
-        else:
-            try:
-                res = client.futures_create_order(
+
+    def collect(chunk_no, fut):
+        try:
+            res = fut.result()
+            logger.info("Chunk response: %s", res)
+            results.append(res)
+        except Exception:
+            logger.exception("Failed chunk order")
+            results.append({"chunk": chunk_no, "status": "ERROR"})
+
+    # Absolute deadlines from a monotonic clock: chunk i fires at
+    # start + (i+1)*interval, so order latency doesn't accumulate as drift.
+    # Submissions run on a worker thread and each response is collected only
+    # after the NEXT chunk is already in flight, so a round trip slower than
+    # the interval delays result bookkeeping, never the firing schedule.
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = None  # (chunk_no, future) from the previous iteration
+        for i in range(chunks):
+            # The remainder rides on the last chunk
+            is_last = i == (chunks - 1)
+            execute_str = last_qty_str if is_last else qty_per_str
+            logger.info("TWAP chunk %d/%d qty=%s", i + 1, chunks, execute_str)
+
+            if dry_run or client is None:
+                logger.info("Dry-run: skipping actual market order")
+                results.append({"chunk": i + 1, "status": "DRY_RUN", "qty": execute_str})
+            else:
+                fut = executor.submit(
+                    submit_order,
+                    client,
+                    order_client,
                     symbol=symbol,
                     side=side,
                     type="MARKET",
-                    quantity=float(execute_qty),
+                    quantity=execute_str,
                 )
-                logger.info(f"Chunk response: {res}")
-                results.append(res)
-            except Exception:
-                logger.exception("Failed chunk order")
-                results.append({"chunk": i + 1, "status": "ERROR"})
+                if pending is not None:
+                    collect(*pending)
+                pending = (i + 1, fut)
+
+            # Sleep until the next chunk's deadline unless it's the last one
+            if not is_last:
+                deadline = start + (i + 1) * interval
+                time.sleep(max(0.0, deadline - time.monotonic()))
 
-        # Sleep between chunks unless it's the last one
-        if i < (chunks - 1):
-            time.sleep(interval)
+        if pending is not None:
+            collect(*pending)
 
     return results
 
@@ -78,11 +110,12 @@ if __name__ == "__main__":
     try:
         symbol = validate_symbol(args.symbol)
         side = validate_side(args.side)
-        total, chunks, duration = validate_twap_params(args.total, args.chunks, args.duration)
+        total, chunks, duration, chunks_dec = validate_twap_params(args.total, args.chunks, args.duration)
     except Exception as e:
         logger.error(f"Validation error: {e}")
         raise SystemExit(1)
 
     client = create_client()
-    res = run_twap(client, symbol, side, total, chunks, duration, dry_run=args.dry_run)
+    order_client = clients.get_order_client() if not args.dry_run else None
+    res = run_twap(client, symbol, side, total, chunks, duration, dry_run=args.dry_run, order_client=order_client, chunks_dec=chunks_dec)
     logger.info(f"TWAP result: {res}")
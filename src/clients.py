@@ -0,0 +1,47 @@
+
+import os
+from functools import lru_cache
+
+from binance.client import Client
+from requests.adapters import HTTPAdapter
+
+from logger_config import get_logger
+from ws_client import WSOrderClient
+
+logger = get_logger(__name__)
+
+API_KEY = os.getenv("BINANCE_API_KEY")
+API_SECRET = os.getenv("BINANCE_API_SECRET")
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Process-wide Binance Futures client, or None if API keys are missing
+    (implies dry-run only). Built once per process so every order in a
+    long-running strategy (TWAP over minutes, a standing grid) reuses the
+    same keep-alive session and pays the TLS handshake a single time; the
+    mounted HTTPAdapter keeps a small pool of warm connections.
+    """
+    if not API_KEY or not API_SECRET:
+        logger.warning("API key/secret not found in environment; running dry-run only")
+        return None
+    client = Client(API_KEY, API_SECRET)
+    client.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_order_client():
+    """
+    Process-wide WebSocket order client, or None when API keys are missing
+    or the connection cannot be established — submit_order falls back to
+    REST whenever this is None, so order placement degrades gracefully.
+    """
+    if not API_KEY or not API_SECRET:
+        return None
+    try:
+        return WSOrderClient(API_KEY, API_SECRET).start()
+    except Exception:
+        logger.exception("Could not start WS order client; orders will go over REST")
+        return None
@@ -0,0 +1,76 @@
+
+import json
+import os
+import time
+from decimal import Decimal
+from functools import lru_cache
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# On-disk cache so CLI reruns don't re-hit /fapi/v1/exchangeInfo
+CACHE_FILE = "exchange_info_cache.json"
+CACHE_TTL_S = 24 * 3600
+
+
+def _load_from_disk():
+    # ValueError covers a truncated/corrupt file (json.JSONDecodeError);
+    # any unreadable cache just means a fresh fetch
+    try:
+        if time.time() - os.path.getmtime(CACHE_FILE) > CACHE_TTL_S:
+            return None
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_to_disk(filters):
+    # Write-then-rename so a process killed mid-write can't leave a
+    # half-written cache behind
+    tmp = CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(filters, f)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        logger.exception("Could not persist exchange info cache")
+
+
+@lru_cache(maxsize=1)
+def load_info(client) -> dict:
+    """
+    Returns {symbol: (tick_size, step_size)} as Decimals for every futures
+    symbol, fetched once per process (and served from the disk cache across
+    CLI reruns until it is a day old). Quantizing prices/quantities to the
+    real filters up front avoids rejection round trips from the exchange.
+    """
+    filters = _load_from_disk()
+    if filters is None:
+        info = client.futures_exchange_info()
+        filters = {}
+        for s in info.get("symbols", []):
+            tick = step = None
+            for f in s.get("filters", []):
+                if f.get("filterType") == "PRICE_FILTER":
+                    tick = f.get("tickSize")
+                elif f.get("filterType") == "LOT_SIZE":
+                    step = f.get("stepSize")
+            if tick and step:
+                filters[s["symbol"]] = (tick, step)
+        _save_to_disk(filters)
+        logger.info("Loaded exchange info filters for %d symbols", len(filters))
+    return {sym: (Decimal(t).normalize(), Decimal(st).normalize()) for sym, (t, st) in filters.items()}
+
+
+def get_filters(client, symbol: str):
+    """Return (tick_size, step_size) for `symbol`, or None if unknown."""
+    if client is None:
+        return None
+    return load_info(client).get(symbol)
+
+
+def price_decimals(tick_size: Decimal) -> int:
+    """Number of decimal places implied by a tick size (0.01 -> 2)."""
+    return max(0, -tick_size.as_tuple().exponent)
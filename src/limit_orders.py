@@ -1,29 +1,25 @@
 
-import os
 import argparse
 from decimal import Decimal
-from binance.client import Client
 from binance.enums import FUTURE_ORDER_TYPE_LIMIT
+import clients
 from logger_config import get_logger
 from validation import validate_symbol, validate_side, validate_quantity, validate_price
+from ws_client import submit_order
 
 logger = get_logger(__name__)
 
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
-
 
 def create_client():
-    """Return a Binance client or None if API keys are missing (implies dry-run only)."""
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    """Return the shared keep-alive Binance client, or None if API keys are missing (implies dry-run only)."""
+    return clients.get_client()
 
 
-def place_limit_order(client, symbol: str, side: str, qty: Decimal, price: Decimal, time_in_force: str = "GTC", dry_run: bool = True):
+def place_limit_order(client, symbol: str, side: str, qty: Decimal, price: Decimal, time_in_force: str = "GTC", dry_run: bool = True, order_client=None):
     """
     Place a limit order. If dry_run or client is None, simulate the action.
+    When a WSOrderClient is injected, the order goes out over its persistent
+    WebSocket connection instead of a fresh REST round trip.
     """
     logger.info(f"Placing limit order: {symbol} {side} {qty} @ {price} TIF={time_in_force}")
     if dry_run or client is None:
@@ -31,12 +27,14 @@ def place_limit_order(client, symbol: str, side: str, qty: Decimal, price: Decim
         return {"status": "DRY_RUN", "symbol": symbol, "side": side, "qty": str(qty), "price": str(price)}
 
     try:
-        response = client.futures_create_order(
+        response = submit_order(
+            client,
+            order_client,
             symbol=symbol,
             side=side,
             type=FUTURE_ORDER_TYPE_LIMIT,
             timeInForce=time_in_force,
-            quantity=float(qty),
+            quantity=format(qty, "f"),
             price=str(price),
         )
         logger.info(f"Order response: {response}")
@@ -66,7 +64,8 @@ def main():
         return
 
     client = create_client()
-    res = place_limit_order(client, symbol, side, qty, price, dry_run=args.dry_run)
+    order_client = clients.get_order_client() if not args.dry_run else None
+    res = place_limit_order(client, symbol, side, qty, price, dry_run=args.dry_run, order_client=order_client)
     logger.info(f"Result: {res}")
 
 
@@ -1,23 +1,28 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Default log filename (can be overridden if you want)
 LOG_FILE = "bot.log"
 
-def get_logger(name: str = "binance_bot") -> logging.Logger:
+# Single background listener shared by every logger; created on first use
+_listener = None
+_log_queue = None
+
+
+def _ensure_listener():
     """
-    Returns a configured logger. Uses a RotatingFileHandler (5MB per file,
-    3 backups) and a console StreamHandler. Levels:
-      - File: DEBUG (detailed logs, stack traces)
-      - Console: INFO (user-facing)
+    Build the shared log queue and start the QueueListener that owns the
+    real handlers. Loggers only enqueue records (microseconds), while the
+    RotatingFileHandler's disk I/O and rotation happen on the listener's
+    background thread — log calls in the trading hot paths never block on
+    the filesystem.
     """
-    logger = logging.getLogger(name)
-    # If logger already configured (e.g., imported multiple times), reuse it.
-    if logger.handlers:
-        return logger
-
-    logger.setLevel(logging.DEBUG)
+    global _listener, _log_queue
+    if _listener is not None:
+        return
 
     fmt = logging.Formatter(
         "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
@@ -33,7 +38,38 @@ def get_logger(name: str = "binance_bot") -> logging.Logger:
     sh.setLevel(logging.INFO)
     sh.setFormatter(fmt)
 
-    logger.addHandler(fh)
-    logger.addHandler(sh)
+    _log_queue = queue.Queue(-1)
+    _listener = QueueListener(_log_queue, fh, sh, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush and stop the background log listener (safe to call twice)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str = "binance_bot") -> logging.Logger:
+    """
+    Returns a configured logger. Handlers live on a background QueueListener
+    (RotatingFileHandler, 5MB per file, 3 backups, plus a console
+    StreamHandler); the logger itself only carries a QueueHandler. Levels:
+      - File: DEBUG (detailed logs, stack traces)
+      - Console: INFO (user-facing)
+    """
+    logger = logging.getLogger(name)
+    # If logger already configured (e.g., imported multiple times), reuse it.
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(logging.DEBUG)
+    # Don't bubble records up to the root logger (avoids double emission)
+    logger.propagate = False
+
+    _ensure_listener()
+    logger.addHandler(QueueHandler(_log_queue))
 
     return logger
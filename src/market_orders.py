@@ -1,40 +1,35 @@
 
-import os
 import argparse
 from decimal import Decimal
-from binance.client import Client
 from binance.enums import FUTURE_ORDER_TYPE_MARKET
+import clients
 from logger_config import get_logger
 from validation import validate_symbol, validate_side, validate_quantity
+from ws_client import submit_order
 
 logger = get_logger(__name__)
 
-# Load API keys from environment variables
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
-
 
 def create_client():
-    """Initialize Binance Futures client, or None if keys not found (dry-run only)."""
-    if not API_KEY or not API_SECRET:
-        logger.warning("API key/secret not found in environment; running dry-run only")
-        return None
-    return Client(API_KEY, API_SECRET)
+    """Return the shared keep-alive Binance Futures client, or None if keys not found (dry-run only)."""
+    return clients.get_client()
 
 
-def place_market_order(client, symbol: str, side: str, qty: Decimal, dry_run: bool = True):
-    """Places a market order or simulates if dry-run is enabled."""
+def place_market_order(client, symbol: str, side: str, qty: Decimal, dry_run: bool = True, order_client=None):
+    """Places a market order (over WS when an order client is injected) or simulates if dry-run is enabled."""
     logger.info(f"Placing market order: {symbol} {side} {qty}")
     if dry_run or client is None:
         logger.info("Dry-run mode: not sending order to Binance")
         return {"status": "DRY_RUN", "symbol": symbol, "side": side, "qty": str(qty)}
 
     try:
-        response = client.futures_create_order(
+        response = submit_order(
+            client,
+            order_client,
             symbol=symbol,
             side=side,
             type=FUTURE_ORDER_TYPE_MARKET,
-            quantity=float(qty)
+            quantity=format(qty, "f")
         )
         logger.info(f"Order response: {response}")
         return response
@@ -61,7 +56,8 @@ def main():
         return
 
     client = create_client()
-    res = place_market_order(client, symbol, side, qty, dry_run=args.dry_run)
+    order_client = clients.get_order_client() if not args.dry_run else None
+    res = place_market_order(client, symbol, side, qty, dry_run=args.dry_run, order_client=order_client)
     logger.info(f"Result: {res}")
 
 
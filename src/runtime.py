@@ -0,0 +1,55 @@
+
+import asyncio
+import threading
+
+from binance.streams import ThreadedWebsocketManager
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Shared event loop + socket manager for all strategies. Before this module,
+# each strategy owned its own thread and its own ThreadedWebsocketManager
+# (one per stop-limit watcher, one per OCO module), so N concurrent
+# strategies cost N threads and N exchange connections. Everything now
+# multiplexes onto one loop thread and one manager.
+_lock = threading.Lock()
+_loop = None
+_twm = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            t = threading.Thread(target=_loop.run_forever, name="strategy-loop", daemon=True)
+            t.start()
+            logger.debug("Started shared strategy event loop")
+    return _loop
+
+
+def run(coro):
+    """Run a coroutine on the shared loop from sync code and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+def submit(coro):
+    """Schedule a coroutine on the shared loop; returns a concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def get_ws_manager(api_key: str, api_secret: str) -> ThreadedWebsocketManager:
+    """
+    Return the shared ThreadedWebsocketManager, starting it on first use.
+    All market-data and user-data subscriptions across strategies ride on
+    this one manager (and one listen key) instead of one manager each.
+    """
+    global _twm
+    with _lock:
+        if _twm is None:
+            _twm = ThreadedWebsocketManager(api_key=api_key, api_secret=api_secret)
+            _twm.start()
+            logger.debug("Started shared websocket manager")
+    return _twm
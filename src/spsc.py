@@ -0,0 +1,50 @@
+
+import time
+
+
+class SPSCRing:
+    """
+    Lock-free single-producer/single-consumer ring buffer.
+
+    Built for exactly one writer (the websocket callback thread) and one
+    reader (the strategy loop): the producer only advances `_head`, the
+    consumer only advances `_tail`, and under CPython's GIL each int
+    store/load is atomic, so no mutex or condition variable is needed.
+    Enqueue is a list store plus an int increment — no lock handoff even
+    when hundreds of ticks land in the same millisecond — and the consumer
+    drains in batches rather than waking per item. Indices grow
+    monotonically; slots are addressed modulo capacity.
+    """
+
+    __slots__ = ("_buf", "_capacity", "_head", "_tail")
+
+    def __init__(self, capacity: int = 4096):
+        self._capacity = capacity
+        self._buf = [None] * capacity
+        self._head = 0  # next write slot, touched only by the producer
+        self._tail = 0  # next read slot, touched only by the consumer
+
+    def put_nowait(self, item) -> bool:
+        """Producer side: enqueue, or drop and return False when full."""
+        head = self._head
+        if head - self._tail >= self._capacity:
+            return False
+        self._buf[head % self._capacity] = item
+        self._head = head + 1
+        return True
+
+    def get_many(self, timeout: float = 0.001) -> list:
+        """
+        Consumer side: drain everything currently queued, spin-waiting up
+        to `timeout` seconds for the first item. Returns [] on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while self._tail == self._head:
+            if time.monotonic() >= deadline:
+                return []
+            time.sleep(0.0002)
+        head = self._head
+        tail = self._tail
+        items = [self._buf[i % self._capacity] for i in range(tail, head)]
+        self._tail = head
+        return items
@@ -1,24 +1,37 @@
+import re
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Tuple
 
 # Optional: can be extended to fetch symbols from Binance exchange info
-SUPPORTED_SYMBOLS = None  
+SUPPORTED_SYMBOLS = None
+
+# Precompiled once; validation runs per order in batch/grid loops
+_SYMBOL_RE = re.compile(r"^[A-Z0-9]{6,20}$")
+_SIDES = frozenset({"BUY", "SELL"})
+
+@lru_cache(maxsize=128)
+def _validate_symbol_cached(symbol: str) -> str:
+    s = symbol.upper()
+    if not _SYMBOL_RE.fullmatch(s):
+        raise ValueError(f"Invalid symbol: {symbol}")
+    return s
 
 def validate_symbol(symbol: str) -> str:
     """
-    Ensures symbol looks valid (non-empty, at least 6 chars).
+    Ensures symbol looks valid (6-20 uppercase alphanumerics).
     Example: BTCUSDT, ETHUSDT
     """
-    if not isinstance(symbol, str) or len(symbol) < 6:
+    if not isinstance(symbol, str):
         raise ValueError(f"Invalid symbol: {symbol}")
-    return symbol.upper()
+    return _validate_symbol_cached(symbol)
 
 def validate_side(side: str) -> str:
     """
     Validates order side: BUY or SELL.
     """
     s = side.upper()
-    if s not in ("BUY", "SELL"):
+    if s not in _SIDES:
         raise ValueError("Side must be BUY or SELL")
     return s
 
@@ -46,12 +59,26 @@ def validate_price(price: str) -> Decimal:
         raise ValueError("Price must be > 0")
     return d
 
-def validate_twap_params(total_qty: str, chunks: str, duration_s: str) -> Tuple[Decimal, int, int]:
+def validate_price_as_float(price: str) -> Tuple[Decimal, float]:
+    """
+    Validates a price and returns both the exact Decimal (for order params)
+    and its float form (for hot-path comparisons), parsed in one pass.
     """
-    Special validation for TWAP strategy.
-    Ensures total quantity, number of chunks, and duration (seconds) are valid.
+    d = validate_price(price)
+    return d, float(d)
+
+def validate_twap_params(total_qty: str, chunks: str, duration_s: str) -> Tuple[Decimal, int, int, Decimal]:
     """
-    total = validate_quantity(total_qty)
+    Single-pass validation for the TWAP strategy: parses total quantity,
+    chunk count and duration once, and also returns the chunk count as a
+    Decimal so `run_twap` doesn't have to rebuild it for the slicing math.
+    """
+    try:
+        total = Decimal(total_qty)
+    except InvalidOperation:
+        raise ValueError("Quantity must be a decimal number")
+    if total <= 0:
+        raise ValueError("Quantity must be > 0")
     try:
         chunks_i = int(chunks)
         duration_i = int(duration_s)
@@ -61,4 +88,4 @@ def validate_twap_params(total_qty: str, chunks: str, duration_s: str) -> Tuple[
         raise ValueError("chunks must be > 0")
     if duration_i < 0:
         raise ValueError("duration must be >= 0")
-    return total, chunks_i, duration_i
+    return total, chunks_i, duration_i, Decimal(chunks_i)
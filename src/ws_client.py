@@ -0,0 +1,300 @@
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from urllib.parse import urlencode
+
+import websockets
+
+import runtime
+from logger_config import get_logger
+
+# orjson parses/serializes JSON 2-5x faster than stdlib and works on bytes
+# straight off the wire; fall back to stdlib if it isn't installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+logger = get_logger(__name__)
+
+# Binance USDT-M Futures WebSocket API endpoint (order placement over WS)
+WS_API_URL = "wss://ws-fapi.binance.com/ws-fapi/v1"
+
+# Timeouts raised after a request hit the wire: the order may well be live
+# on the exchange even though no response arrived, so these must never be
+# answered by blindly re-sending
+_TIMEOUT_ERRORS = (asyncio.TimeoutError, FuturesTimeoutError, TimeoutError)
+
+
+# Cap on cached signed-request templates per WSOrderClient
+MAX_BUILDERS = 256
+
+
+class OrderSendError(Exception):
+    """
+    The request failed before it was written to the socket, so the exchange
+    never saw it. This (and only this) makes a plain REST re-send safe.
+    """
+
+
+class SignedRequestBuilder:
+    """
+    Pre-builds the invariant part of a signed request payload once, so
+    repeated orders with identical params (TWAP chunks, re-quoted grid
+    levels) only splice in a fresh timestamp and re-run the HMAC per call
+    instead of re-encoding the whole param set. In Binance's signing
+    scheme the params are signed in sorted key order, so the payload
+    splits cleanly into a fixed prefix (keys < "timestamp") and suffix
+    (keys > "timestamp") around the one volatile field. The HMAC-SHA256
+    itself rides on OpenSSL via hashlib, which picks up SHA hardware
+    extensions for free.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, base_params: dict):
+        self._secret = api_secret.encode()
+        # Canonicalize booleans to the JSON spelling up front: urlencode
+        # would sign Python's "False" while the wire carries JSON false,
+        # and Binance re-derives the signature from the wire form (-1022)
+        self._base = {
+            k: ("true" if v else "false") if isinstance(v, bool) else v
+            for k, v in base_params.items()
+        }
+        self._base["apiKey"] = api_key
+        items = sorted(self._base.items())
+        self._prefix = urlencode([(k, v) for k, v in items if k < "timestamp"])
+        self._suffix = urlencode([(k, v) for k, v in items if k > "timestamp"])
+
+    def sign(self) -> dict:
+        """Return the full signed param dict with a fresh timestamp."""
+        ts = int(time.time() * 1000)
+        payload = f"{self._prefix}&timestamp={ts}"
+        if self._suffix:
+            payload = f"{payload}&{self._suffix}"
+        signed = dict(self._base)
+        signed["timestamp"] = ts
+        signed["signature"] = hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+        return signed
+
+
+class WSOrderClient:
+    """
+    Thin client for Binance's WebSocket order-placement API.
+
+    Opens one persistent authenticated connection at startup and multiplexes
+    `order.place` requests over it, matching responses to requests by `id`.
+    This avoids the per-order TCP+TLS+HTTP overhead of the REST path, so
+    consecutive orders (TWAP chunks, OCO legs, grid levels) go out
+    back-to-back on the same socket. The connection and its reader run on
+    the shared strategy event loop from `runtime`, not a private thread.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, url: str = WS_API_URL, timeout: float = 10.0):
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self._url = url
+        self._timeout = timeout
+        self._ws = None
+        self._pending = {}
+        self._builders = {}
+        self._ids = itertools.count(1)
+        self._loop = runtime.get_loop()
+
+    def start(self):
+        """Connect and start the response reader. Must be called before create_order."""
+        runtime.submit(self._connect()).result(self._timeout)
+        logger.info(f"WS order client connected to {self._url}")
+        return self
+
+    async def _connect(self):
+        self._ws = await websockets.connect(self._url)
+        asyncio.ensure_future(self._reader(), loop=self._loop)
+
+    async def _reader(self):
+        async for raw in self._ws:
+            msg = _json_loads(raw)
+            fut = self._pending.pop(msg.get("id"), None)
+            if fut is not None and not fut.done():
+                fut.set_result(msg)
+
+    def _sign(self, params: dict) -> dict:
+        # One builder per distinct param template: identical repeated orders
+        # (e.g. TWAP chunks) only pay for timestamp + signature per call.
+        # Bounded so a long-running strategy that never repeats a template
+        # (a re-quoting grid emits a fresh price every time) can't grow the
+        # cache without limit — a full reset is cheap and repeated templates
+        # simply re-warm
+        key = tuple(sorted(params.items()))
+        builder = self._builders.get(key)
+        if builder is None:
+            if len(self._builders) >= MAX_BUILDERS:
+                self._builders.clear()
+            builder = self._builders[key] = SignedRequestBuilder(self._api_key, self._api_secret, params)
+        return builder.sign()
+
+    async def _request(self, method: str, params: dict):
+        req_id = next(self._ids)
+        fut = self._loop.create_future()
+        self._pending[req_id] = fut
+        try:
+            try:
+                await self._ws.send(_json_dumps({"id": req_id, "method": method, "params": self._sign(params)}))
+            except Exception as exc:
+                raise OrderSendError(f"WS send failed: {exc!r}") from exc
+            return await asyncio.wait_for(fut, self._timeout)
+        finally:
+            # Remove the entry whether we got a response, timed out or were
+            # cancelled — otherwise abandoned futures pile up forever
+            self._pending.pop(req_id, None)
+
+    def create_order(self, **params) -> dict:
+        """
+        Place one order over the socket and block for its response. Raises
+        OrderSendError if the request never hit the wire, a TimeoutError if
+        it did but no response came back (outcome unknown!), and
+        RuntimeError if the exchange answered with a rejection.
+        """
+        # The outer wait is padded so the coroutine's own wait_for fires
+        # first and cleans up its pending entry
+        msg = runtime.submit(self._request("order.place", params)).result(self._timeout + 1.0)
+        if msg.get("status") != 200:
+            raise RuntimeError(f"WS order rejected: {msg.get('error')}")
+        return msg.get("result")
+
+    def create_orders(self, orders) -> list:
+        """
+        Place many orders concurrently on the one socket: all requests are
+        sent before any response is awaited, so total wall time is ~one
+        round trip instead of len(orders). Returns one entry per order, in
+        input order: the result dict on success, the error dict (with a
+        `code` key, matching the REST batch endpoint's per-item shape) on
+        rejection, or the exception the request died with — one slow or
+        dead request must not force a blanket retry of its siblings.
+        """
+        async def _all():
+            return await asyncio.gather(
+                *[self._request("order.place", p) for p in orders],
+                return_exceptions=True,
+            )
+
+        msgs = runtime.submit(_all()).result(self._timeout + 1.0)
+        out = []
+        for m in msgs:
+            if isinstance(m, BaseException):
+                out.append(m)
+            elif m.get("status") == 200:
+                out.append(m.get("result"))
+            else:
+                out.append(m.get("error", m))
+        return out
+
+    def close(self):
+        # The loop is shared with other strategies, so only close our socket
+        if self._ws is not None:
+            runtime.run(self._ws.close())
+
+
+# Binance's /fapi/v1/batchOrders endpoint caps each request at 5 orders
+BATCH_MAX = 5
+# Worker cap doubles as a crude request-weight throttle for the REST path
+MAX_BATCH_WORKERS = 8
+
+
+def _gen_client_id() -> str:
+    return f"ws-{uuid.uuid4().hex[:20]}"
+
+
+def _recover_order(client, params) -> dict:
+    """
+    The WS response never arrived but the request was (or may have been)
+    sent, so the order may be live — re-sending would risk a duplicate.
+    Query by the pre-assigned client order ID and only re-send over REST
+    once the exchange confirms it has no trace of the order.
+    """
+    cid = params["newClientOrderId"]
+    try:
+        return client.futures_get_order(symbol=params["symbol"], origClientOrderId=cid)
+    except Exception:
+        logger.info("Order %s not found on exchange; re-sending over REST", cid)
+        return client.futures_create_order(**params)
+
+
+def submit_batch(client, order_client, orders) -> list:
+    """
+    Submit a list of order param dicts. Over WS the requests are pipelined
+    concurrently on the one socket; over REST they are packed into
+    /fapi/v1/batchOrders requests of up to 5 orders each, with the batch
+    calls themselves issued in parallel from a small thread pool — so a
+    40-step grid takes ~one round trip of wall time, not 40. Returns one
+    response per order, in input order; failed items carry a `code` key
+    instead of an `orderId`. WS requests that never hit the wire are
+    re-sent individually over REST; ones that timed out after sending are
+    recovered by client order ID, never blindly re-sent.
+    """
+    if order_client is not None:
+        # Every order gets a client ID up front so a lost response can be
+        # reconciled by query instead of a duplicate submission
+        for p in orders:
+            p.setdefault("newClientOrderId", _gen_client_id())
+        try:
+            responses = order_client.create_orders(orders)
+        except Exception:
+            # The batch as a whole died (e.g. the blocking wait timed out):
+            # some requests may have been sent, so reconcile each one
+            logger.exception("WS batch outcome unknown; recovering each order by client ID")
+            return [_recover_order(client, p) for p in orders]
+        out = []
+        for p, res in zip(orders, responses):
+            if isinstance(res, OrderSendError):
+                # Never left this process — a plain re-send is safe
+                logger.warning("WS send failed for %s; re-sending over REST", p["newClientOrderId"])
+                out.append(client.futures_create_order(**p))
+            elif isinstance(res, BaseException):
+                out.append(_recover_order(client, p))
+            else:
+                out.append(res)
+        return out
+
+    def _send(chunk):
+        return client.futures_place_batch_order(batchOrders=_json_dumps(chunk).decode())
+
+    chunks = [orders[i:i + BATCH_MAX] for i in range(0, len(orders), BATCH_MAX)]
+    if len(chunks) == 1:
+        return _send(chunks[0])
+    with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_BATCH_WORKERS)) as ex:
+        return [res for chunk_res in ex.map(_send, chunks) for res in chunk_res]
+
+
+def submit_order(client, order_client, **params) -> dict:
+    """
+    Send one order via the WS client when available, falling back to REST.
+    All order-placement modules route through this so the WS fast path and
+    the REST fallback behave the same everywhere. The REST fallback only
+    fires when the WS request never hit the wire; a response timeout means
+    the order may already be live, so it is recovered by client order ID
+    instead of re-sent. Exchange rejections propagate to the caller.
+    """
+    if order_client is not None:
+        params.setdefault("newClientOrderId", _gen_client_id())
+        try:
+            return order_client.create_order(**params)
+        except OrderSendError:
+            logger.exception("WS order was never sent; falling back to REST")
+        except _TIMEOUT_ERRORS:
+            logger.exception("WS order response timed out; recovering by client order ID")
+            return _recover_order(client, params)
+    return client.futures_create_order(**params)